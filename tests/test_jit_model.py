@@ -0,0 +1,54 @@
+import pytest
+import torch
+
+from xequinet import keys
+from xequinet.interface import resolve_jit_model
+
+# a small model is enough to exercise every code path
+MODEL_KWARGS = {
+    "node_dim": 16,
+    "node_irreps": "16x0e + 8x1o",
+    "num_basis": 8,
+    "action_blocks": 1,
+}
+
+
+def water() -> dict:
+    return {
+        keys.ATOMIC_NUMBERS: torch.tensor([8, 1, 1]),
+        keys.POSITIONS: torch.tensor(
+            [[0.0, 0.0, 0.117], [0.0, 0.757, -0.469], [0.0, -0.757, -0.469]]
+        ),
+        keys.EDGE_INDEX: torch.tensor([[0, 0, 1, 1, 2, 2], [1, 2, 0, 2, 0, 1]]),
+    }
+
+
+def isolated_atom() -> dict:
+    return {
+        keys.ATOMIC_NUMBERS: torch.tensor([8]),
+        keys.POSITIONS: torch.zeros((1, 3)),
+        keys.EDGE_INDEX: torch.zeros((2, 0), dtype=torch.long),
+    }
+
+
+@pytest.mark.parametrize(
+    "mode, output_mode", [("lmp", "energy"), ("dipole", "dipole"), ("gmx", "energy")]
+)
+def test_script(mode: str, output_mode: str) -> None:
+    model = resolve_jit_model(mode=mode, output_modes=[output_mode], **MODEL_KWARGS)
+    torch.jit.script(model.eval())
+
+
+@pytest.mark.parametrize("unit_style", ["metal", "real", "electron"])
+@pytest.mark.parametrize("system", [water, isolated_atom])
+def test_scripted_lmp_matches_eager(unit_style: str, system) -> None:
+    torch.manual_seed(0)
+    model = resolve_jit_model(mode="lmp", unit_style=unit_style, **MODEL_KWARGS)
+    model.eval()
+    ref = model(system(), compute_forces=True, compute_virial=True)
+    # same steps as `xeq jit`
+    model.fold_unit_factors()
+    model_script = torch.jit.freeze(torch.jit.script(model))
+    out = model_script(system(), compute_forces=True, compute_virial=True)
+    for prop in [keys.TOTAL_ENERGY, keys.FORCES, keys.VIRIAL]:
+        torch.testing.assert_close(out[prop], ref[prop])
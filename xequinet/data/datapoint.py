@@ -110,5 +110,3 @@ class XequiData(Data):
         if polar is not None:
             assert polar.shape == (1, 3, 3) and polar.dtype == dtype
             self.polar = polar
-        for key, value in kwargs.items():
-            setattr(self, key, value)
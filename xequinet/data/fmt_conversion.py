@@ -19,8 +19,10 @@ def datapoint_from_ase(atoms: ase.Atoms, dtype: torch.dtype = None) -> XequiData
     pos_factor = unit_conversion("Angstrom", pos_unit)
 
     atomic_numbers = atoms.get_atomic_numbers()
-    pos = atoms.get_positions(wrap=True) * pos_factor
+    # `get_positions` returns a fresh array, so it is safe to scale in place
+    pos = torch.from_numpy(atoms.get_positions(wrap=True)).mul_(pos_factor).to(dtype)
     pbc = atoms.get_pbc()
+    # but `get_cell().array` is a view into `atoms`, so scale it out of place
     cell = atoms.get_cell().array * pos_factor if pbc.any() else None
     # if one want to set charge, please set `charge=...` in the comment line
     charge = int(atoms.info.get("charge", 0))
@@ -33,9 +35,9 @@ def datapoint_from_ase(atoms: ase.Atoms, dtype: torch.dtype = None) -> XequiData
     else:
         spin = 0
     return XequiData(
-        atomic_numbers=torch.from_numpy(atomic_numbers).to(torch.int),
-        pos=torch.from_numpy(pos).to(dtype),
-        pbc=torch.from_numpy(pbc).view(1, 3).to(torch.bool),
+        atomic_numbers=torch.as_tensor(atomic_numbers, dtype=torch.int),
+        pos=pos,
+        pbc=torch.as_tensor(pbc, dtype=torch.bool).view(1, 3),
         cell=torch.from_numpy(cell).view(1, 3, 3).to(dtype)
         if cell is not None
         else None,
@@ -52,12 +54,12 @@ def datapoint_from_pyscf(mole: gto.Mole, dtype: torch.dtype = None) -> XequiData
     pos_factor = unit_conversion("Bohr", pos_unit)
 
     atomic_numbers = mole.atom_charges()
-    pos = mole.atom_coords() * pos_factor
+    pos = torch.from_numpy(mole.atom_coords()).mul_(pos_factor).to(dtype)
     charge = mole.charge
     spin = mole.spin
     return XequiData(
-        atomic_numbers=torch.from_numpy(atomic_numbers).to(torch.int),
-        pos=torch.from_numpy(pos).to(dtype),
+        atomic_numbers=torch.as_tensor(atomic_numbers, dtype=torch.int),
+        pos=pos,
         charge=torch.tensor([charge], dtype=torch.int),
         spin=torch.tensor([spin], dtype=torch.int),
     )
@@ -53,6 +53,9 @@ class LMDBDataset(torch_data.Dataset[T]):
             create=False,
             readonly=True,
             lock=False,
+            # samples are visited in shuffled order, so OS readahead mostly
+            # pulls in pages that will not be used before they are evicted
+            readahead=False,
         )
         self.entries = self.lmdb_env.stat()["entries"]
         self.is_open = True
@@ -62,10 +65,13 @@ class LMDBDataset(torch_data.Dataset[T]):
         assert self.is_open
         if not isinstance(index, int):
             raise IndexError(f"Index must be an integer, not {type(index)}")
-        with self.lmdb_env.begin(write=False) as txn:
+        # `buffers=True` hands back a memoryview into the memory map instead of
+        # copying the record into a bytes object; it is only valid inside the
+        # transaction, which is fine since it is unpickled right away
+        with self.lmdb_env.begin(write=False, buffers=True) as txn:
             key = generate_lmdb_key(index)
             buf = txn.get(key)
-            if not buf:
+            if buf is None:
                 raise IndexError(f"Index {index} out of bounds")
             val: T = pickle.loads(buf)
             if self.transform is not None:
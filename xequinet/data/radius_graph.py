@@ -1,3 +1,4 @@
+import itertools
 from typing import List, Tuple
 
 import torch
@@ -17,8 +18,9 @@ def wrap_positions(
     # by default not changing positions
     shift_T = torch.zeros_like(pos).T
 
+    # invert once per graph rather than once per atom
+    cell_inv = torch.linalg.inv(cell).repeat_interleave(n_nodes_per_graph, dim=0)
     cell = cell.repeat_interleave(n_nodes_per_graph, dim=0)
-    cell_inv = torch.linalg.inv(cell)
 
     fractional = torch.bmm(pos.unsqueeze(1), cell_inv).squeeze(1)
     fractional_T = fractional.T
@@ -160,7 +162,8 @@ def radius_graph_pbc(
 
     # [sender, receiver]
     compute_dist = [
-        compute_dist_one_graph(i, j) for i, j in zip(graph_begin, graph_end)
+        compute_dist_one_graph(i, j)
+        for i, j in zip(graph_begin.tolist(), graph_end.tolist())
     ]
 
     def _compute_nr_edges(edges: List[torch.Tensor]) -> int:
@@ -172,7 +175,7 @@ def radius_graph_pbc(
     )
     # flatten index to get 0-based indices
     # [ [ix0, iy0], [ix1, iy1], ...]: [n_edges, 2]
-    index0 = torch.cat(sum(compute_dist, []))
+    index0 = torch.cat(list(itertools.chain.from_iterable(compute_dist)))
     # iy is in range (0, ... sum(Vi * n_cells)) but we need (0, ... sum(Vi))
     ix = index0[:, 0]
     iy = torch.div(index0[:, 1], n_cells, rounding_mode="floor")
@@ -54,7 +54,9 @@ class NeighborTransform(Transform):
 
             if data.edge_index is not None:
                 return data
-            max_possible_neighbors = torch.sum(n_nodes_per_graph**2).item()
+            # one batched call for all graphs; a node can have at most as many
+            # neighbors as there are nodes in its own graph
+            max_possible_neighbors = n_nodes_per_graph.max().item()
             edge_index = radius_graph(
                 x=data.pos,
                 r=self.cutoff,
@@ -98,35 +100,58 @@ class DataTypeTransform(Transform):
 
 
 class UnitTransform(Transform):
-    def __init__(self, data_units: Dict[str, str]) -> None:
+    """
+    Convert properties to the default units in place.
+    Datasets deserialize a fresh object on every access, so no copy is needed;
+    set `copy=True` if the input data is shared elsewhere.
+    """
+
+    def __init__(self, data_units: Dict[str, str], copy: bool = False) -> None:
         self.default_units = qc.get_default_units()
         for k, v in data_units.items():
             assert k in self.default_units, f"Invalid property {k}"
             assert qc.check_unit(v), f"Invalid unit {v} for property {k}"
         self.data_units = data_units
+        # conversion factors are constant, so resolve them once here
+        # instead of parsing unit strings for every sample
+        self.factors = {
+            prop: qc.unit_conversion(unit, self.default_units[prop])
+            for prop, unit in data_units.items()
+        }
+        self.copy = copy
 
     def __call__(self, data: XequiData) -> XequiData:
-        new_data = data.clone()
-        for prop, unit in self.data_units.items():
-            if prop not in new_data:
+        new_data = data.clone() if self.copy else data
+        for prop, factor in self.factors.items():
+            if prop not in new_data or factor == 1.0:
                 continue
-            new_data[prop] *= qc.unit_conversion(unit, self.default_units[prop])
+            new_data[prop].mul_(factor)
         return new_data
 
 
 class DeltaTransform(Transform):
-    def __init__(self, base_targets: Union[str, Iterable[str]]) -> None:
+    """
+    Subtract the base properties from the targets in place.
+    Set `copy=True` if the input data is shared elsewhere.
+    """
+
+    def __init__(
+        self,
+        base_targets: Union[str, Iterable[str]],
+        copy: bool = False,
+    ) -> None:
         self.base_targets = (
             base_targets if isinstance(base_targets, Iterable) else [base_targets]
         )
         self.targets = [keys.BASE_PROPERTIES[t] for t in self.base_targets]
+        self.copy = copy
 
     def __call__(self, data: XequiData) -> XequiData:
-        new_data = data.clone()
+        new_data = data.clone() if self.copy else data
         for t, bt in zip(self.targets, self.base_targets):
             assert t in new_data, f"Invalid target {t}"
             assert bt in new_data, f"Invalid base target {bt}"
-            new_data[t] -= new_data[bt]
+            new_data[t].sub_(new_data[bt])
             del new_data[bt]
         return new_data
 
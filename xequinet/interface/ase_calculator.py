@@ -27,6 +27,7 @@ class XequiCalculator(Calculator):
         "ckpt_file": "model.pt",
         "dtype": "float32",
         "device": None,
+        "compile": False,
     }
     atoms: Atoms
 
@@ -51,7 +52,11 @@ class XequiCalculator(Calculator):
             torch.set_default_dtype(self.dtype)
         if "device" in changed_parameters:
             self.device = torch.device(self.parameters.device)
-        if "ckpt_file" in changed_parameters or self.model is None:
+        if (
+            "ckpt_file" in changed_parameters
+            or "compile" in changed_parameters
+            or self.model is None
+        ):
             ckpt = torch.load(self.parameters.ckpt_file, map_location=self.device)
             model_config = ckpt["config"]
             set_default_units(model_config["default_units"])
@@ -69,6 +74,11 @@ class XequiCalculator(Calculator):
                     NeighborTransform(self.model.cutoff_radius),
                 ]
             )
+            # MD replays the same system step after step, so compilation cost is
+            # amortized; `dynamic=True` avoids recompiling when the number of
+            # edges changes
+            if self.parameters.compile:
+                self.model = torch.compile(self.model, dynamic=True)
 
     def calculate(
         self,
@@ -6,9 +6,23 @@ from xequinet import keys
 from xequinet.data.radius_graph import single_radius_graph
 from xequinet.nn.basic import compute_edge_data, compute_properties
 from xequinet.nn.model import BaseModel, XPaiNN
+from xequinet.nn.output import EnergyOut
 from xequinet.utils import get_default_units, unit_conversion
 
 
+@torch.no_grad()
+def fold_energy_factor(model: BaseModel, factor: float) -> None:
+    """
+    Scale the final linear layer of every energy head by `factor`,
+    so that the model directly predicts energies in the target unit.
+    """
+    for mod in model.mods.values():
+        if isinstance(mod, EnergyOut):
+            final_linear = mod.out_mlp[-1]
+            final_linear.weight.mul_(factor)
+            final_linear.bias.mul_(factor)
+
+
 class XPaiNNLMP(XPaiNN):
     """
     XPaiNN script model for force field. This model does not consider batch.
@@ -36,6 +50,16 @@ class XPaiNNLMP(XPaiNN):
         self.net_charge = net_charge
         self.cutoff_radius /= self.pos_unit_factor
 
+    def fold_unit_factors(self) -> None:
+        """
+        Fold the energy unit conversion into the output weights.
+        Must be called after the state dict is loaded.
+        """
+        fold_energy_factor(self, self.energy_unit_factor)
+        # forces carry the energy factor too, only the length part is left
+        self.forces_unit_factor /= self.energy_unit_factor
+        self.energy_unit_factor = 1.0
+
     def forward(
         self,
         data: Dict[str, torch.Tensor],
@@ -58,7 +82,9 @@ class XPaiNNLMP(XPaiNN):
             - `forces` (Optional): Atomic forces.
             - `virial` (Optional): Virial tensor.
         """
-        data[keys.POSITIONS] *= self.pos_unit_factor
+        # out of place, so that the caller's positions are left untouched
+        if self.pos_unit_factor != 1.0:
+            data[keys.POSITIONS] = data[keys.POSITIONS] * self.pos_unit_factor
         if self.net_charge is not None:
             data[keys.TOTAL_CHARGE] = torch.tensor(
                 [self.net_charge], device=data[keys.POSITIONS].device
@@ -79,11 +105,12 @@ class XPaiNNLMP(XPaiNN):
             training=self.training,
             extra_properties=self.extra_properties,
         )
-        result[keys.TOTAL_ENERGY] *= self.energy_unit_factor
-        if compute_forces:
+        if self.energy_unit_factor != 1.0:
+            result[keys.TOTAL_ENERGY] *= self.energy_unit_factor
+            if compute_virial:
+                result[keys.VIRIAL] *= self.energy_unit_factor
+        if compute_forces and self.forces_unit_factor != 1.0:
             result[keys.FORCES] *= self.forces_unit_factor
-        if compute_virial:
-            result[keys.VIRIAL] *= self.energy_unit_factor
         return result
 
 
@@ -123,7 +150,9 @@ class XPaiNNDipole(XPaiNN):
             A dictionary containing the following keys:
             - `dipole`: Dipole moment.
         """
-        data[keys.POSITIONS] *= self.pos_unit_factor
+        # out of place, so that the caller's positions are left untouched
+        if self.pos_unit_factor != 1.0:
+            data[keys.POSITIONS] = data[keys.POSITIONS] * self.pos_unit_factor
         if self.net_charge is not None:
             data[keys.TOTAL_CHARGE] = torch.tensor(
                 [self.net_charge], device=data[keys.POSITIONS].device
@@ -159,6 +188,15 @@ class XPaiNNGMX(XPaiNN):
         )
         self.net_charge = net_charge
 
+    def fold_unit_factors(self) -> None:
+        """
+        Fold the energy unit conversion into the output weights.
+        Must be called after the state dict is loaded.
+        """
+        fold_energy_factor(self, self.energy_unit_factor)
+        self.forces_unit_factor /= self.energy_unit_factor
+        self.energy_unit_factor = 1.0
+
     def forward(
         self,
         positions: torch.Tensor,
@@ -213,7 +251,9 @@ class XPaiNNGMX(XPaiNN):
         for mod in self.mods.values():
             data = mod(data)
 
-        return data[keys.TOTAL_ENERGY] * self.energy_unit_factor
+        if self.energy_unit_factor != 1.0:
+            return data[keys.TOTAL_ENERGY] * self.energy_unit_factor
+        return data[keys.TOTAL_ENERGY]
 
 
 def resolve_jit_model(
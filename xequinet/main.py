@@ -92,6 +92,11 @@ def main() -> None:
         default=None,
         help="Net charge for jit model.",
     )
+    parser.add_argument(
+        "--no-freeze",
+        action="store_true",
+        help="Do not freeze the jit model.",
+    )
     parser.add_argument(
         "--device",
         type=str,
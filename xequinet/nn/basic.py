@@ -1,3 +1,4 @@
+import functools
 import math
 from typing import Dict, Iterable, List, Optional, Tuple
 
@@ -28,7 +29,8 @@ class ResidualLayer(nn.Module):
         self.inv_sqrt_2 = 1 / math.sqrt(2)
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
-        return self.inv_sqrt_2 * (x + self.mlp(x))
+        # the sum is a fresh tensor, so it can be scaled in place
+        return torch.add(x, self.mlp(x)).mul_(self.inv_sqrt_2)
 
 
 class Int2c1eEmbedding(nn.Module):
@@ -57,6 +59,19 @@ class Int2c1eEmbedding(nn.Module):
         return self.embed_ten[at_no]
 
 
+def single_batch(
+    n_atoms: int, device: torch.device
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """`batch` and `ptr` for a single graph with `n_atoms` atoms"""
+    batch = torch.zeros(n_atoms, dtype=torch.long, device=device)
+    batch_ptr = torch.tensor([0, n_atoms], dtype=torch.long, device=device)
+    return batch, batch_ptr
+
+
+# the tensors are only ever read, so they can be shared between calls
+cached_single_batch = functools.lru_cache(maxsize=16)(single_batch)
+
+
 def compute_edge_data(
     data: Dict[str, torch.Tensor],
     compute_forces: bool = True,
@@ -66,137 +81,114 @@ def compute_edge_data(
     pos = data[keys.POSITIONS]
     edge_index = data[keys.EDGE_INDEX]
 
-    single_graph = False
     if keys.BATCH not in data:
-        data[keys.BATCH] = torch.zeros(
-            pos.shape[0], dtype=torch.long, device=pos.device
-        )
-        data[keys.BATCH_PTR] = torch.tensor(
-            [0, pos.shape[0]], dtype=torch.long, device=pos.device
-        )
-        single_graph = True
-    elif data[keys.BATCH].max() == 0:
-        single_graph = True
+        if torch.jit.is_scripting():
+            batch, batch_ptr = single_batch(pos.shape[0], pos.device)
+        else:
+            # eager MD/optimization calls see the same system every step
+            batch, batch_ptr = cached_single_batch(pos.shape[0], pos.device)
+        data[keys.BATCH] = batch
+        data[keys.BATCH_PTR] = batch_ptr
 
     batch = data[keys.BATCH]
+    # read the number of graphs from the shape of `ptr` rather than
+    # `batch.max()`, which would force a device to host sync
     n_graphs = data[keys.BATCH_PTR].numel() - 1
+    single_graph = n_graphs == 1
 
-    has_cell = keys.CELL in data
-    if has_cell:
+    cell: Optional[torch.Tensor] = None
+    if keys.CELL in data:
         cell = data[keys.CELL]
-    else:
-        cell = torch.empty((0, 3, 3), device=pos.device)
 
     if compute_forces:
         pos.requires_grad_()
 
-    strain = torch.zeros(
-        (n_graphs, 3, 3),
-        dtype=pos.dtype,
-        device=pos.device,
-    )
-
+    # the strain is only needed as a handle for the virial
     if compute_virial:
+        # TorchScript does not accept `requires_grad` as a keyword here
+        strain = torch.zeros((n_graphs, 3, 3), dtype=pos.dtype, device=pos.device)
         strain.requires_grad_()
+        data[keys.STRAIN] = strain
         symm_strain = 0.5 * (strain + strain.transpose(1, 2))
-        # position
+        # position, x + x @ e in a single fused kernel
         expanded_strain = torch.index_select(symm_strain, 0, batch)
-        pos = pos + torch.bmm(pos.unsqueeze(1), expanded_strain).squeeze(1)
+        pos_ = pos.unsqueeze(1)
+        pos = torch.baddbmm(pos_, pos_, expanded_strain).squeeze(1)
         # cell
-        if has_cell:
-            cell = cell + torch.bmm(cell, symm_strain)
+        if cell is not None:
+            cell = torch.baddbmm(cell, cell, symm_strain)
 
     # vectors are pointing from center to neighbor
-    center_idx, neighbor_idx = (
-        edge_index[keys.CENTER_IDX],
-        edge_index[keys.NEIGHBOR_IDX],
-    )
-    vectors = torch.index_select(pos, 0, center_idx) - torch.index_select(
-        pos, 0, neighbor_idx
+    # gather both endpoints in one kernel, [2, n_edges, 3]
+    # the edge count is explicit so that graphs without edges also work
+    edge_pos = torch.index_select(pos, 0, edge_index.reshape(-1)).view(
+        2, edge_index.shape[1], 3
     )
+    vectors = edge_pos[keys.CENTER_IDX] - edge_pos[keys.NEIGHBOR_IDX]
 
     # offsets for periodic boundary conditions
-    if has_cell:
+    if cell is not None:
         cell_offsets = data[keys.CELL_OFFSETS]
         if single_graph:
-            shifts = torch.einsum("ni, ij -> nj", cell_offsets, cell.squeeze(0))
+            shifts = torch.mm(cell_offsets, cell.squeeze(0))
             vectors = vectors - shifts
         else:
+            neighbor_idx = edge_index[keys.NEIGHBOR_IDX]
             batch_neighbor = torch.index_select(batch, 0, neighbor_idx)
             cell_batch = torch.index_select(cell, 0, batch_neighbor)
-            shifts = torch.einsum("ni, nij -> nj", cell_offsets, cell_batch)
+            shifts = torch.bmm(cell_offsets.unsqueeze(1), cell_batch).squeeze(1)
             vectors = vectors - shifts
 
     # compute distances
-    dist = torch.linalg.norm(vectors, dim=-1)
+    # written out rather than `linalg.norm` so that the fuser can merge it
+    # with the elementwise ops above; edges never have zero length
+    dist = (vectors * vectors).sum(dim=-1).sqrt()
 
     data.update(
         {
             keys.EDGE_LENGTH: dist,
             keys.EDGE_VECTOR: vectors,
-            keys.STRAIN: strain,
         }
     )
     return data
 
 
-def compute_forces_only(
-    energy: torch.Tensor,
-    pos: torch.Tensor,
-    training: bool = True,
-) -> torch.Tensor:
-    """Compute forces from energy and positions"""
-    grad_outputs: Optional[List[Optional[torch.Tensor]]] = [torch.ones_like(energy)]
-    pos_grad = torch.autograd.grad(
-        outputs=[energy],
-        inputs=[pos],
-        grad_outputs=grad_outputs,
-        retain_graph=training,
-        create_graph=training,
-    )[0]
-    if pos_grad is None:
-        pos_grad = torch.zeros_like(pos)
-    return -1.0 * pos_grad
-
-
-def compute_virial_only(
+def compute_gradients(
     energy: torch.Tensor,
-    strain: torch.Tensor,
+    pos: Optional[torch.Tensor] = None,
+    strain: Optional[torch.Tensor] = None,
     training: bool = True,
-) -> torch.Tensor:
-    """Compute virial from energy and strain"""
-    grad_outputs: Optional[List[Optional[torch.Tensor]]] = [torch.ones_like(energy)]
-    strain_grad = torch.autograd.grad(
-        outputs=[energy],
-        inputs=[strain],
-        grad_outputs=grad_outputs,
-        retain_graph=training,
-        create_graph=training,
-    )[0]
-    if strain_grad is None:
-        strain_grad = torch.zeros_like(strain)
-    return -1.0 * strain_grad
-
-
-def compute_forces_and_virial(
-    energy: torch.Tensor,
-    pos: torch.Tensor,
-    strain: torch.Tensor,
-    training: bool = True,
-) -> Tuple[torch.Tensor, torch.Tensor]:
+) -> Tuple[Optional[torch.Tensor], Optional[torch.Tensor]]:
+    """
+    Compute forces and/or virial from energy with a single backward pass.
+    Pass `pos` for forces and `strain` for virial, the other result is `None`.
+    """
+    inputs: List[torch.Tensor] = []
+    if pos is not None:
+        inputs.append(pos)
+    if strain is not None:
+        inputs.append(strain)
     grad_outputs: Optional[List[Optional[torch.Tensor]]] = [torch.ones_like(energy)]
-    pos_grad, strain_grad = torch.autograd.grad(
+    grads = torch.autograd.grad(
         outputs=[energy],
-        inputs=[pos, strain],
+        inputs=inputs,
         grad_outputs=grad_outputs,
         retain_graph=training,
         create_graph=training,
     )
-    if pos_grad is None:
-        pos_grad = torch.zeros_like(pos)
-    if strain_grad is None:
-        strain_grad = torch.zeros_like(strain)
-    return -1.0 * pos_grad, -1.0 * strain_grad
+    forces: Optional[torch.Tensor] = None
+    virial: Optional[torch.Tensor] = None
+    if pos is not None:
+        pos_grad = grads[0]
+        if pos_grad is None:
+            pos_grad = torch.zeros_like(pos)
+        forces = -1.0 * pos_grad
+    if strain is not None:
+        strain_grad = grads[-1]
+        if strain_grad is None:
+            strain_grad = torch.zeros_like(strain)
+        virial = -1.0 * strain_grad
+    return forces, virial
 
 
 def compute_properties(
@@ -208,29 +200,23 @@ def compute_properties(
 ) -> Dict[str, torch.Tensor]:
     """Compute properties from data"""
     results = {}
-    if compute_forces and compute_virial:
-        forces, virial = compute_forces_and_virial(
-            energy=data[keys.TOTAL_ENERGY],
-            pos=data[keys.POSITIONS],
-            strain=data[keys.STRAIN],
-            training=training,
-        )
-        results[keys.FORCES] = forces
-        results[keys.VIRIAL] = virial
-    elif compute_forces:
-        forces = compute_forces_only(
+    if compute_forces or compute_virial:
+        pos: Optional[torch.Tensor] = None
+        strain: Optional[torch.Tensor] = None
+        if compute_forces:
+            pos = data[keys.POSITIONS]
+        if compute_virial:
+            strain = data[keys.STRAIN]
+        forces, virial = compute_gradients(
             energy=data[keys.TOTAL_ENERGY],
-            pos=data[keys.POSITIONS],
+            pos=pos,
+            strain=strain,
             training=training,
         )
-        results[keys.FORCES] = forces
-    elif compute_virial:
-        virial = compute_virial_only(
-            energy=data[keys.TOTAL_ENERGY],
-            strain=data[keys.STRAIN],
-            training=training,
-        )
-        results[keys.VIRIAL] = virial
+        if forces is not None:
+            results[keys.FORCES] = forces
+        if virial is not None:
+            results[keys.VIRIAL] = virial
 
     if extra_properties is not None:
         results.update({k: data[k] for k in extra_properties})
@@ -238,25 +224,23 @@ def compute_properties(
     return results
 
 
+ACTIVATIONS = {
+    "relu": nn.ReLU,
+    "leakyrelu": nn.LeakyReLU,
+    "softplus": nn.Softplus,
+    "sigmoid": nn.Sigmoid,
+    "silu": nn.SiLU,
+    "tanh": nn.Tanh,
+    "identity": nn.Identity,
+}
+ACTIVATIONS_DIV_X = {"silu": "sigmoid", "relu": "identity", "leakyrelu": "identity"}
+
+
 def resolve_activation(activation: str, devide_x: bool = False) -> nn.Module:
     """Helper function to return activation function"""
     activation = activation.lower()
-    activation_div_x = {"silu": "sigmoid", "relu": "identity", "leakyrelu": "identity"}
-    if devide_x and activation in activation_div_x:
-        activation = activation_div_x[activation]
-    if activation == "relu":
-        return nn.ReLU()
-    elif activation == "leakyrelu":
-        return nn.LeakyReLU()
-    elif activation == "softplus":
-        return nn.Softplus()
-    elif activation == "sigmoid":
-        return nn.Sigmoid()
-    elif activation == "silu":
-        return nn.SiLU()
-    elif activation == "tanh":
-        return nn.Tanh()
-    elif activation == "identity":
-        return nn.Identity()
-    else:
+    if devide_x:
+        activation = ACTIVATIONS_DIV_X.get(activation, activation)
+    if activation not in ACTIVATIONS:
         raise NotImplementedError(f"Unsupported activation function {activation}")
+    return ACTIVATIONS[activation]()
@@ -1,7 +1,11 @@
+import contextlib
 from typing import Dict, Iterable, List, Optional, Union
 
 import torch
 import torch.nn as nn
+from torch.utils.checkpoint import checkpoint
+
+from xequinet import keys
 
 from .basic import compute_edge_data, compute_properties
 from .electronic import ChargeEmbedding, SpinEmbedding
@@ -10,13 +14,30 @@ from .output import resolve_output
 from .xpainn import XEmbedding, XPainnMessage, XPainnUpdate
 
 
+def checkpoint_mod(
+    mod: nn.Module, data: Dict[str, torch.Tensor]
+) -> Dict[str, torch.Tensor]:
+    """Run a module with activation checkpointing."""
+    # modules write their outputs into the dict, so hand them a copy,
+    # otherwise the recomputation in backward would see the outputs as inputs
+    return checkpoint(lambda d: mod(dict(d)), data, use_reentrant=False)
+
+
 class BaseModel(nn.Module):
     cutoff_radius: float
+    checkpoint_mods: List[str]
+    autocast_mods: List[str]
+    autocast_dtype: Optional[torch.dtype]
 
     def __init__(self) -> None:
         super().__init__()
         self.mods = nn.ModuleDict()
         self.extra_properties = []
+        # names of modules in `mods` to checkpoint during training
+        self.checkpoint_mods = []
+        # names of modules in `mods` to run under autocast with `autocast_dtype`
+        self.autocast_mods = []
+        self.autocast_dtype = None
 
     def forward(
         self,
@@ -24,20 +45,36 @@ class BaseModel(nn.Module):
         compute_forces: bool = True,
         compute_virial: bool = False,
     ) -> Dict[str, torch.Tensor]:
-        data = compute_edge_data(
-            data=data,
-            compute_forces=compute_forces,
-            compute_virial=compute_virial,
-        )
-        for mod in self.mods.values():
-            data = mod(data)
-        result = compute_properties(
-            data=data,
-            compute_forces=compute_forces,
-            compute_virial=compute_virial,
-            training=self.training,
-            extra_properties=self.extra_properties,
-        )
+        # nothing is differentiated in evaluation without forces or virial,
+        # so do not record the autograd graph at all
+        # (not `inference_mode`, since callers may update the outputs in place)
+        need_grad = self.training or compute_forces or compute_virial
+        with torch.set_grad_enabled(need_grad and torch.is_grad_enabled()):
+            data = compute_edge_data(
+                data=data,
+                compute_forces=compute_forces,
+                compute_virial=compute_virial,
+            )
+            device_type = data[keys.POSITIONS].device.type
+            for name, mod in self.mods.items():
+                # only enter autocast where asked, so that an outer autocast
+                # set by the caller is left alone for the other modules
+                if name in self.autocast_mods:
+                    amp = torch.autocast(device_type, dtype=self.autocast_dtype)
+                else:
+                    amp = contextlib.nullcontext()
+                with amp:
+                    if self.training and name in self.checkpoint_mods:
+                        data = checkpoint_mod(mod, data)
+                    else:
+                        data = mod(data)
+            result = compute_properties(
+                data=data,
+                compute_forces=compute_forces,
+                compute_virial=compute_virial,
+                training=self.training,
+                extra_properties=self.extra_properties,
+            )
         return result
 
 
@@ -63,6 +100,8 @@ class XPaiNN(BaseModel):
         charge_embed: bool = kwargs.get("charge_embed", False)
         spin_embed: bool = kwargs.get("spin_embed", False)
         output_modes: Union[str, List[str]] = kwargs.get("output_modes", ["energy"])
+        use_checkpoint: bool = kwargs.get("use_checkpoint", False)
+        mixed_precision: Optional[str] = kwargs.get("mixed_precision", None)
 
         self.cutoff_radius = cutoff
         embed = XEmbedding(
@@ -106,6 +145,16 @@ class XPaiNN(BaseModel):
             )
             self.mods[f"message_{i}"] = message
             self.mods[f"update_{i}"] = update
+            if use_checkpoint:
+                self.checkpoint_mods.extend([f"message_{i}", f"update_{i}"])
+            if mixed_precision is not None:
+                self.autocast_mods.extend([f"message_{i}", f"update_{i}"])
+        if mixed_precision is not None:
+            name_to_dtype = {"bfloat16": torch.bfloat16, "float16": torch.float16}
+            assert (
+                mixed_precision in name_to_dtype
+            ), f"Invalid mixed precision dtype {mixed_precision}"
+            self.autocast_dtype = name_to_dtype[mixed_precision]
 
         if output_modes is None:
             output_modes = ["energy"]
@@ -352,7 +352,9 @@ class SpatialOut(OutputModule):
         )
         nn.init.zeros_(self.scalar_out_mlp[0].bias)
         nn.init.zeros_(self.scalar_out_mlp[2].bias)
-        self.register_buffer("masses", torch.Tensor(qc.ATOM_MASS))
+        # copy, so that `load_state_dict` cannot write into the shared table
+        masses = qc.ATOM_MASS.to(torch.get_default_dtype(), copy=True)
+        self.register_buffer("masses", masses)
         self.extra_properties = [keys.SPATIAL_EXTENT]
 
     def forward(self, data: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
@@ -360,9 +362,10 @@ class SpatialOut(OutputModule):
         batch = data[keys.BATCH]
         pos = data[keys.POSITIONS]
         atomic_numbers = data[keys.ATOMIC_NUMBERS]
-        masses = self.masses[atomic_numbers]
+        masses = self.masses.index_select(0, atomic_numbers).unsqueeze(-1)  # [N, 1]
         centroids = scatter(masses * pos, batch, dim=0) / scatter(masses, batch, dim=0)
-        pos -= centroids[batch]
+        # out of place, `pos` is the input of force computation
+        pos = pos - centroids.index_select(0, batch)
 
         node_scalar = data[keys.NODE_INVARIANT]
         scalar_out = self.scalar_out_mlp(node_scalar)
@@ -155,6 +155,10 @@ class XPainnMessage(nn.Module):
 
         ori_scalar = data[keys.NODE_INVARIANT]
         ori_equi = data[keys.NODE_EQUIVARIANT]
+        # messages may be in lower precision under autocast,
+        # keep the node features in the model dtype
+        message_scalar = message_scalar.to(ori_scalar.dtype)
+        message_equi = message_equi.to(ori_equi.dtype)
         data[keys.NODE_INVARIANT] = ori_scalar.index_add(0, center_idx, message_scalar)
         data[keys.NODE_EQUIVARIANT] = ori_equi.index_add(0, center_idx, message_equi)
 
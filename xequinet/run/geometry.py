@@ -106,24 +106,17 @@ def calc_numerical_hessian(
     """Calculate the hessian with numerical second derivative."""
     energy, _ = xequi_method(mole, transform, model, device, base_method)
     hessian = np.zeros((mole.natm, mole.natm, 3, 3))
-    atomic_numbers = mole.atom_charges()
     pos = mole.atom_coords(unit="Bohr")
+    # displace a single copy of the molecule instead of re-parsing it each time
+    d_mol = mole.copy()
     h = 1e-5
     for i in range(mole.natm):
         for j in range(3):
             pos[i, j] += h
-            d_mol = gto.M(
-                atom=[(a, c) for a, c in zip(atomic_numbers, pos)],
-                unit="Bohr",
-                charge=mole.charge,
-            )
+            d_mol.set_geom_(pos, unit="Bohr")
             _, gfwd = xequi_method(d_mol, transform, model, device, base_method)
             pos[i, j] -= 2 * h
-            d_mol = gto.M(
-                atom=[(a, c) for a, c in zip(atomic_numbers, pos)],
-                unit="Bohr",
-                charge=mole.charge,
-            )
+            d_mol.set_geom_(pos, unit="Bohr")
             _, gbak = xequi_method(d_mol, transform, model, device, base_method)
             pos[i, j] += h
             hessian[i, :, j, :] = (gfwd - gbak) / (2 * h)
@@ -67,26 +67,26 @@ def inference(
                     xtb_forces = -xtb_res.get("gradient") * unit_conversion(
                         "au", default_units[keys.FORCES]
                     )
-                    result[keys.FORCES][batch == i] += torch.tensor(
-                        xtb_forces, device=device
-                    )
+                    result[keys.FORCES][batch == i] += torch.from_numpy(
+                        xtb_forces
+                    ).to(device)
                 if keys.VIRIAL in result:
                     xtb_virial = xtb_res.get("virial") * unit_conversion(
                         "au", default_units[keys.VIRIAL]
                     )
-                    result[keys.VIRIAL][i] += torch.tensor(xtb_virial, device=device)
+                    result[keys.VIRIAL][i] += torch.from_numpy(xtb_virial).to(device)
                 if keys.ATOMIC_CHARGES in result:
                     xtb_charges = xtb_res.get("charges") * unit_conversion(
                         "e", default_units[keys.TOTAL_CHARGE]
                     )
-                    result[keys.ATOMIC_CHARGES][batch == i] += torch.tensor(
-                        xtb_charges, device=device
-                    )
+                    result[keys.ATOMIC_CHARGES][batch == i] += torch.from_numpy(
+                        xtb_charges
+                    ).to(device)
                 if keys.DIPOLE in result:
                     xtb_dipole = xtb_res.get("dipole") * unit_conversion(
                         "au", default_units[keys.DIPOLE]
                     )
-                    result[keys.DIPOLE][i] += torch.tensor(xtb_dipole, device=device)
+                    result[keys.DIPOLE][i] += torch.from_numpy(xtb_dipole).to(device)
 
             # write to output file
             with open(output_file, "a") as f:
@@ -70,7 +70,15 @@ def compile_model(args: argparse.Namespace) -> None:
 
     # load checkpoint
     model.load_state_dict(ckpt["model"])
+    # let the output head predict energies in the target unit directly
+    if hasattr(model, "fold_unit_factors"):
+        model.fold_unit_factors()
     model_script = torch.jit.script(model)
+    # freezing inlines parameters and attributes as constants so that the
+    # graph can be constant-folded; gradients w.r.t. the inputs (forces, virial)
+    # still work, but `optimize_for_inference` is skipped since it breaks autograd
+    if not args.no_freeze:
+        model_script = torch.jit.freeze(model_script)
 
     # save model
     n_species = qc.ELEMENTS_DICT["Rn"] + 1  # currently support up to Rn
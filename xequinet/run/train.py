@@ -118,14 +118,16 @@ def run_train(args: argparse.Namespace) -> None:
         num_workers=config.trainer.num_workers,
         pin_memory=True,
         drop_last=True,
+        persistent_workers=config.trainer.num_workers > 0,
     )
     valid_loader = DataLoader(
         dataset=valid_dataset,
         batch_size=config.data.valid_batch_size // world_size,
         sampler=valid_sampler,
-        num_workers=0,
+        num_workers=config.trainer.num_workers,
         pin_memory=True,
         drop_last=False,
+        persistent_workers=config.trainer.num_workers > 0,
     )
 
     # calculate the mean and std of the training dataset
@@ -155,12 +157,14 @@ def run_train(args: argparse.Namespace) -> None:
 
     # -------------------  build model ------------------- #
     # initialize model
-    model = resolve_model(
-        model_name=config.model.model_name,
-        node_shift=node_shift,
-        node_scale=node_scale,
-        **config.model.model_kwargs,
-    )
+    # rank 0 goes first so that precomputed embeddings are generated only once
+    with distributed_zero_first(local_rank):
+        model = resolve_model(
+            model_name=config.model.model_name,
+            node_shift=node_shift,
+            node_scale=node_scale,
+            **config.model.model_kwargs,
+        )
     log.s.info(model)
     model.to(device)
 
@@ -1,7 +1,9 @@
+import os
 import re
+from functools import lru_cache
 from math import pi
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 
 import numpy as np
 import torch
@@ -79,30 +81,38 @@ DEFAULT_UNITS_MAP = {
 }
 
 
+# a token is a name, an integer, or any other single non-space character;
+# a name glued to a number (e.g. "2eV") stays one token and is rejected
+UNIT_TOKEN_PATTERN = re.compile(r"[A-Za-z_]\w*|\d\w*|\S")
+UNIT_OPERATORS = {"+", "-", "*", "/", "^", "(", ")"}
+
+
+@lru_cache(maxsize=None)
 def check_unit(unit: str) -> bool:
     """Check if the unit is valid and safe."""
-    split_unit = re.split(r"[+ | \- | * | / | ^ | ( | )]", unit)
-    for u in split_unit:
-        if u == '':
-            continue
-        elif u in units:
+    # named units are by far the most common tokens, so test them first
+    for token in UNIT_TOKEN_PATTERN.findall(unit):
+        if token in units or token.isdigit() or token in UNIT_OPERATORS:
             continue
-        elif u.isdigit():
-            continue
-        else:
-            return False
+        return False
     return True
 
 
+# units are fixed constants, so the value of a unit string never changes
+@lru_cache(maxsize=None)
 def eval_unit(unit: str) -> float:
     """Evaluate the unit."""
     if not check_unit(unit):
         raise ValueError(f"Invalid unit {unit}")
-    unit = unit.replace('^', '**')
-
-    return eval(unit)
+    expr = unit.replace('^', '**')
+    # only the unit names are visible to the expression
+    try:
+        return eval(expr, {"__builtins__": {}}, units)
+    except SyntaxError:
+        raise ValueError(f"Invalid unit {unit}") from None
 
 
+@lru_cache(maxsize=None)
 def unit_conversion(unit_in: Optional[str], unit_out: Optional[str]) -> float:
     if unit_in is None or unit_out is None:
         return 1.
@@ -178,7 +188,7 @@ ATOM_MULT = [-1,
            3, 4, 5, 6, 5, 4, 3, 2, 1, 2, 3, 4, 3, 2, 1,
 ]
 # atomic masses
-ATOM_MASS = torch.Tensor([0.0,
+_ATOM_MASS_NP = np.array([0.0,
     1.008,                                                                                                                 4.003,
     6.941, 9.012,                                                                       10.81, 12.01, 14.01, 16.00, 19.00, 20.18,
     22.99, 24.31,                                                                       26.98, 28.09, 30.97, 32.06, 35.45, 39.95,
@@ -187,36 +197,88 @@ ATOM_MASS = torch.Tensor([0.0,
     132.9, 137.3,
                   138.9, 140.1, 140.9, 144.2, 145.,  150.4, 152.0, 157.3, 158.9, 162.5, 164.9, 167.3, 168.9, 173.1, 175.0,
                          178.5, 180.9, 183.8, 186.2, 190.2, 192.2, 195.1, 197.0, 200.6, 204.4, 207.2, 209.,  210.,  210.,  222.,
-])
+], dtype=np.float32)
+# torch view sharing memory with the NumPy table
+ATOM_MASS = torch.from_numpy(_ATOM_MASS_NP)
+
+# a basis name understood by pyscf, or shells already parsed from a file
+BasisType = Union[str, List[list]]
+
+
+def _int2c1e_embedding(
+    atom: str,
+    mult: int,
+    basis: BasisType,
+    orbaux: BasisType,
+    nao_aux: int,
+    ao_loc_nr: np.ndarray,
+) -> np.ndarray:
+    """Projection of the atomic orbitals of one element onto auxiliary basis."""
+    mol = gto.M(
+        atom=f"X 0 0 0; {atom} 0 0 0",
+        basis={'X': orbaux, atom: basis},
+        spin=mult - 1,
+    )
+    ovlp = mol.intor("int1e_ovlp")
+    # only the first function of each auxiliary shell is kept,
+    # so gather those rows before reducing
+    projection = ovlp[ao_loc_nr, nao_aux:]
+    # embedding = np.sum(np.abs(projection), axis=-1))
+    return np.sum(projection, axis=-1)
 
 
 def gen_int2c1e(embed_basis: str = "gfn2-xtb", aux_basis: str = "aux56") -> None:
     """
     Projection of atomic orbitals onto auxiliary basis.
     """
-    int2c1e_dict = {}
-    if (BASIS_FOLDER / f"{embed_basis}.dat").exists():
-        basis = str(BASIS_FOLDER / f"{embed_basis}.dat")
+    # parse the basis files once here instead of letting every Mole re-read them
+    basis_file = BASIS_FOLDER / f"{embed_basis}.dat"
+    if basis_file.exists():
+        basis_text = basis_file.read_text()
+        basis = [gto.basis.parse(basis_text, atom) for atom in ELEMENTS_LIST[1:]]
     else:
-        basis = embed_basis
-    orbaux = str(BASIS_FOLDER / f"{aux_basis}.dat")
+        basis = [embed_basis] * (len(ELEMENTS_LIST) - 1)
+    orbaux = gto.basis.load(str(BASIS_FOLDER / f"{aux_basis}.dat"), "X")
     savefile = PRE_FOLDER / f"{embed_basis}_{aux_basis}.pt"
     aux = gto.M(atom="X 0 0 0", basis={'X': orbaux})
     nao_aux = aux.nao
     ao_loc_nr = aux.ao_loc_nr()[:-1]
 
-    for atom, mult in zip(ELEMENTS_LIST[1:], ATOM_MULT[1:]):
-        mol = gto.M(
-            atom=f"X 0 0 0; {atom} 0 0 0",
-            basis={'X': orbaux, atom: basis},
-            spin=mult - 1,
+    # save the table ready to use, row 0 is the dummy atom and stays zero;
+    # the embeddings are only input features, so single precision is plenty
+    embed_tenor = torch.zeros((len(ELEMENTS_LIST), len(ao_loc_nr)), dtype=torch.float32)
+    elements = zip(ELEMENTS_LIST[1:], ATOM_MULT[1:], basis)
+    for i, (atom, mult, atom_basis) in enumerate(elements, start=1):
+        embedding = _int2c1e_embedding(
+            atom, mult, atom_basis, orbaux, nao_aux, ao_loc_nr
         )
-        ovlp = mol.intor("int1e_ovlp")
-        projection = ovlp[:nao_aux, nao_aux:]
-        # embedding = np.sum(np.abs(projection), axis=-1))
-        embedding = np.sum(projection, axis=-1)
-        int2c1e_dict[atom] = torch.from_numpy(embedding[ao_loc_nr])
-    torch.save(int2c1e_dict, savefile)
+        embed_tenor[i] = torch.from_numpy(embedding)
+    # write to a private file and rename it into place, so that concurrent
+    # processes never see a partially written table
+    tmpfile = savefile.with_name(f"{savefile.name}.{os.getpid()}.tmp")
+    torch.save(embed_tenor, tmpfile)
+    os.replace(tmpfile, savefile)
+
+
+@lru_cache(maxsize=None)
+def _load_embedding_tensor(embed_basis: str, aux_basis: str) -> torch.Tensor:
+    """Load (and generate if needed) the embedding table once per process."""
+    if not (PRE_FOLDER / f"{embed_basis}_{aux_basis}.pt").exists():
+        gen_int2c1e(embed_basis, aux_basis)
+    # the file only holds tensors, so skip the general unpickler
+    embed_dict = torch.load(
+        PRE_FOLDER / f"{embed_basis}_{aux_basis}.pt",
+        map_location="cpu",
+        weights_only=True,
+    )
+    if isinstance(embed_dict, torch.Tensor):
+        return embed_dict
+    # older files store one tensor per element, row 0 is the dummy atom
+    first = embed_dict[ELEMENTS_LIST[1]]
+    embed_tenor = first.new_zeros((len(ELEMENTS_LIST), first.shape[-1]))
+    for i, atom in enumerate(ELEMENTS_LIST[1:], start=1):
+        embed_tenor[i] = embed_dict[atom]
+    return embed_tenor
 
 
 def get_embedding_tensor(embed_basis: str = "gfn2-xtb", aux_basis: str = "aux28") -> torch.Tensor:
@@ -229,12 +291,10 @@ def get_embedding_tensor(embed_basis: str = "gfn2-xtb", aux_basis: str = "aux28"
     Returns:
         a tensor of shape ``(n_atoms, n_aux)``
     """
-    if not (PRE_FOLDER / f"{embed_basis}_{aux_basis}.pt").exists():
-        gen_int2c1e(embed_basis, aux_basis)
-    embed_dict = torch.load(PRE_FOLDER / f"{embed_basis}_{aux_basis}.pt")
-    embed_tenor = torch.stack([embed_dict[atom] for atom in ELEMENTS_LIST[1:]])
-    embed_tenor = torch.cat([torch.zeros(1, embed_tenor.shape[-1]), embed_tenor])
-    return embed_tenor.to(torch.get_default_dtype())
+    embed_tenor = _load_embedding_tensor(embed_basis, aux_basis)
+    # always hand out a copy, since callers register it as a buffer
+    # and `load_state_dict` would otherwise write into the cached table
+    return embed_tenor.to(torch.get_default_dtype(), copy=True)
 
 
 if __name__ == "__main__":